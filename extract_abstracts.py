@@ -6,86 +6,384 @@ Date: November 2025
 """
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+import httpx
+import asyncio
+from selectolax.lexbor import LexborHTMLParser
 import time
 import re
+import string
 import logging
-from urllib.parse import urlparse
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import urlencode, urlparse
+from email.utils import parsedate_to_datetime
 import json
-from typing import Dict, Optional, Tuple
+from collections import defaultdict
+import sqlite3
+from typing import Callable, Dict, Iterator, Optional, Tuple
 import os
 from tqdm import tqdm
 
 # Setup logging
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
         logging.FileHandler('extraction.log'),
         logging.StreamHandler()
     ]
 )
+# httpx logs every request at INFO; keep those out of extraction.log like urllib3 did
+logging.getLogger('httpx').setLevel(logging.WARNING)
+logging.getLogger('httpcore').setLevel(logging.WARNING)
+
+def start_log_listener() -> QueueListener:
+    """Move the root logger's handlers onto a background QueueListener thread.
+    
+    Afterwards logging calls only enqueue records; the listener does the file/console I/O.
+    The queue handler and its consumer are installed together, so records are never stranded.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    
+    # Drain the queue before the interpreter exits
+    atexit.register(listener.stop)
+    return listener
+
+# Minimum seconds between request starts per host; hosts not listed are only
+# throttled by the rate-limit headers they send back
+HOST_INTERVALS = {
+    'www.scopus.com': 0.25,
+}
+
+# Concurrent requests per host; hosts not listed get PaperExtractor's per_host_limit
+HOST_CONCURRENCY = {
+    'www.scopus.com': 4,
+    'api.crossref.org': 20,
+}
+
+# Responses worth retrying with exponential back-off
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Scopus pages are mostly navigation and scripts after the abstract and keywords, so
+# downloads stop once both have closed or this many bytes have arrived
+SCOPUS_MAX_BYTES = 128 * 1024
+STREAM_CHUNK_SIZE = 16384
+_KEYWORD_SPAN_RE = re.compile(rb'<span[^>]*\bclass=["\'][^"\']*\bkeyword\b')
+
+def scopus_record_loaded(buf: bytearray) -> bool:
+    """Check whether a partial Scopus page already contains the whole abstract section and keyword.
+    
+    Keywords come after the abstract; until one has been seen, keep reading up to SCOPUS_MAX_BYTES.
+    """
+    start = buf.find(b'abstractSection')
+    if start == -1 or buf.find(b'</section>', start) == -1:
+        return False
+    keyword = _KEYWORD_SPAN_RE.search(buf)
+    return keyword is not None and buf.find(b'</span>', keyword.end()) != -1
+
+# CrossRef works endpoint; its filter accepts many DOIs per request
+CROSSREF_WORKS_URL = 'https://api.crossref.org/works'
+CROSSREF_BATCH_SIZE = 100
+
+# Cheap shape checks so malformed links and DOIs never cost a request
+_is_http_url = re.compile(r'^https?://[^\s]+$').match
+_is_doi = re.compile(r'^10\.\d{4,9}/\S+$').match
+
+# Text cleaning patterns, compiled once instead of on every clean_text call
+_WS_RE = re.compile(r'\s+')
+_ALLOWED_CHARS = frozenset(string.ascii_letters + string.digits + '.,;:()-')
+
+class _DisallowedCharTable(dict):
+    """str.translate table deleting everything but letters, digits, whitespace and basic punctuation.
+    
+    Entries are filled in on first lookup, so only code points actually seen are stored.
+    """
+    
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        value = codepoint if char in _ALLOWED_CHARS or char.isspace() else None
+        self[codepoint] = value
+        return value
+
+_DEL_TBL = _DisallowedCharTable()
+
+class AbstractCache:
+    """Persistent SQLite cache of extracted abstracts and keywords, keyed by request URL.
+    
+    The response's ETag and Last-Modified are kept too, so expired entries can be
+    revalidated with a conditional GET instead of downloaded again.
+    """
+    
+    def __init__(self, path: str, ttl: int = 30 * 86400):
+        self.ttl = ttl  # seconds before a cached entry is fetched again
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS abstracts '
+            '(url TEXT PRIMARY KEY, abstract TEXT, keywords TEXT, fetched_at INTEGER, '
+            'etag TEXT, last_modified TEXT)'
+        )
+        # Caches created before validators were stored lack the two columns
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(abstracts)')}
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                self.conn.execute(f'ALTER TABLE abstracts ADD COLUMN {column} TEXT')
+        self.conn.commit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.conn.close()
+    
+    def get(self, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Return the cached (abstract, keywords) for a URL, or None if missing or expired"""
+        return self.conn.execute(
+            'SELECT abstract, keywords FROM abstracts WHERE url = ? AND fetched_at >= ?',
+            (url, int(time.time()) - self.ttl)
+        ).fetchone()
+    
+    def validators(self, url: str) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for revalidating a cached URL"""
+        row = self.conn.execute(
+            'SELECT etag, last_modified FROM abstracts WHERE url = ?', (url,)
+        ).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+    
+    def revalidate(self, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Mark a cached URL as fresh after a 304 Not Modified and return its (abstract, keywords)"""
+        self.conn.execute('UPDATE abstracts SET fetched_at = ? WHERE url = ?', (int(time.time()), url))
+        self.conn.commit()
+        return self.get(url)
+    
+    def set(self, url: str, abstract: str, keywords: Optional[str], etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """Store the extracted abstract and keywords for a URL, with the response's cache validators"""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO abstracts (url, abstract, keywords, fetched_at, etag, last_modified) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (url, abstract, keywords, int(time.time()), etag, last_modified)
+        )
+        self.conn.commit()
 
 class PaperExtractor:
     """Main class for extracting abstracts and keywords from research papers"""
     
-    def __init__(self, rate_limit=2):
-        self.rate_limit = rate_limit  # seconds between requests
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+    def __init__(self, per_host_limit=8, max_retries=5, backoff_base=1.0, cache: Optional[AbstractCache] = None,
+                 mailto: str = ''):
+        self.cache = cache
+        self.mailto = mailto  # contact address for CrossRef's polite pool
+        self.per_host_limit = per_host_limit  # concurrent requests per host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base  # seconds, doubled on every retry
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            # httpx decompresses these transparently (br via the brotli extra)
+            'Accept-Encoding': 'gzip, br, deflate',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+        }
+        self.session: Optional[httpx.AsyncClient] = None
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.host_intervals: Dict[str, float] = dict(HOST_INTERVALS)
+        self.next_allowed: Dict[str, float] = {}  # host -> event loop time of next request
+        self.scopus_tasks: Dict[str, asyncio.Task] = {}  # url -> extraction shared by duplicate rows
+    
+    async def __aenter__(self):
+        # HTTP/2 multiplexes concurrent requests to a host over one TCP+TLS connection
+        self.session = httpx.AsyncClient(
+            http2=True,
+            # requests followed redirects by default; Scopus record links can redirect
+            follow_redirects=True,
+            headers=self.headers,
+            timeout=15.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.session.aclose()
+    
+    def host_limit(self, host: str) -> int:
+        """Get the number of concurrent requests allowed to a host"""
+        return HOST_CONCURRENCY.get(host, self.per_host_limit)
+    
+    def host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Get the semaphore capping concurrent requests to a host"""
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.host_limit(host))
+        return self.host_semaphores[host]
+    
+    async def wait_for_slot(self, host: str) -> None:
+        """Reserve the host's next request slot and sleep until it opens"""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_allowed.get(host, now))
+        self.next_allowed[host] = start + self.host_intervals.get(host, 0)
+        await asyncio.sleep(start - now)
+    
+    def update_rate_limit(self, host: str, response: httpx.Response) -> None:
+        """Adjust the host's pacing from Retry-After and rate-limit response headers"""
+        now = asyncio.get_running_loop().time()
+        headers = response.headers
+        delay = 0.0
+        
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+        elif headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+            # Elsevier style: reset is an epoch timestamp
+            try:
+                delay = float(headers['X-RateLimit-Reset']) - time.time()
+            except ValueError:
+                pass
+        
+        # CrossRef style: "X-Rate-Limit-Limit: 50" per "X-Rate-Limit-Interval: 1s"
+        limit = headers.get('X-Rate-Limit-Limit')
+        interval = headers.get('X-Rate-Limit-Interval')
+        if limit and interval:
+            try:
+                self.host_intervals[host] = float(interval.rstrip('s')) / int(limit)
+            except (ValueError, ZeroDivisionError):
+                pass
+        
+        if delay > 0:
+            self.next_allowed[host] = max(self.next_allowed.get(host, now), now + delay)
+    
+    async def read_body(self, response: httpx.Response, stop_reading: Optional[Callable[[bytearray], bool]],
+                        max_bytes: Optional[int]) -> bytes:
+        """Stream a response body, stopping early once stop_reading(buf) is true or max_bytes is reached"""
+        buf = bytearray()
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            buf += chunk
+            if stop_reading and stop_reading(buf):
+                break
+            if max_bytes and len(buf) >= max_bytes:
+                break
+        return bytes(buf)
+    
+    async def fetch(self, url: str, timeout: int, stop_reading: Optional[Callable[[bytearray], bool]] = None,
+                    max_bytes: Optional[int] = None, headers: Optional[Dict[str, str]] = None
+                    ) -> Tuple[httpx.Response, bytes]:
+        """GET a URL under its host's rate limit, retrying 429/5xx with exponential back-off.
+        
+        Returns the response and its (possibly truncated) decompressed body; the body is
+        empty for a 304 Not Modified answer to conditional request headers.
+        """
+        host = urlparse(url).netloc
+        error = None
+        
+        for attempt in range(self.max_retries):
+            async with self.host_semaphore(host):
+                await self.wait_for_slot(host)
+                try:
+                    async with self.session.stream('GET', url, timeout=timeout, headers=headers) as response:
+                        logging.debug(f"{response.http_version} {response.status_code} {url}")
+                        self.update_rate_limit(host, response)
+                        if response.status_code == 304:
+                            return response, b''
+                        if response.status_code not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            body = await self.read_body(response, stop_reading, max_bytes)
+                            return response, body
+                        error = f"HTTP {response.status_code}"
+                except httpx.TransportError as e:
+                    error = str(e) or type(e).__name__
+            
+            if attempt + 1 < self.max_retries:
+                delay = self.backoff_base * 2 ** attempt
+                logging.debug(f"Retrying {url} in {delay:.0f}s after {error}")
+                await asyncio.sleep(delay)
+        
+        raise httpx.HTTPError(f"Giving up on {url} after {self.max_retries} attempts: {error}")
         
     def clean_text(self, text: str) -> str:
         """Clean and preprocess extracted text"""
         if not text:
             return ""
         
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # HTML tags are already stripped by the parser's .text()
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^a-zA-Z0-9\s.,;:()\-]', '', text)
-        # Strip leading/trailing whitespace
-        text = text.strip()
+        text = text.translate(_DEL_TBL)
+        # Remove extra whitespace and strip leading/trailing whitespace
+        text = _WS_RE.sub(' ', text).strip()
         
         return text
     
-    def extract_from_scopus(self, url: str) -> Tuple[Optional[str], Optional[str]]:
-        """Extract abstract and keywords from Scopus URL"""
+    async def extract_from_scopus(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Extract abstract and keywords from Scopus URL.
+        
+        Rows repeating a URL await the first row's extraction instead of fetching it again.
+        """
+        if url not in self.scopus_tasks:
+            self.scopus_tasks[url] = asyncio.ensure_future(self.fetch_scopus(url))
+        return await asyncio.shield(self.scopus_tasks[url])
+    
+    async def fetch_scopus(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Fetch and parse a Scopus page, going through the persistent cache"""
+        conditional = {}
+        if self.cache:
+            cached = self.cache.get(url)
+            if cached:
+                return cached
+            conditional = self.cache.validators(url)
+        
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            response, body = await self.fetch(
+                url, timeout=15, stop_reading=scopus_record_loaded, max_bytes=SCOPUS_MAX_BYTES,
+                headers=conditional
+            )
+            if response.status_code == 304:
+                return self.cache.revalidate(url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = LexborHTMLParser(body.decode(response.encoding or 'utf-8', errors='replace'))
             
             # Strategy 1: Look for abstract section
             abstract = None
-            abstract_section = soup.find('section', {'id': 'abstractSection'})
-            if abstract_section:
-                abstract_text = abstract_section.find('div', class_='abstract')
-                if abstract_text:
-                    abstract = self.clean_text(abstract_text.get_text())
+            abstract_text = tree.css_first('section#abstractSection div.abstract')
+            if abstract_text:
+                abstract = self.clean_text(abstract_text.text())
             
             # Strategy 2: Try alternative selectors
             if not abstract:
-                abstract_div = soup.find('div', {'class': 'abstract'})
+                abstract_div = tree.css_first('div.abstract')
                 if abstract_div:
-                    abstract = self.clean_text(abstract_div.get_text())
+                    abstract = self.clean_text(abstract_div.text())
             
             # Strategy 3: Look for meta tags
             if not abstract:
-                meta_abstract = soup.find('meta', {'name': 'description'})
+                meta_abstract = tree.css_first('meta[name="description"]')
                 if meta_abstract:
-                    abstract = self.clean_text(meta_abstract.get('content', ''))
+                    abstract = self.clean_text(meta_abstract.attributes.get('content') or '')
             
             # Extract keywords
             keywords = None
-            keywords_section = soup.find('span', {'class': 'keyword'})
+            keywords_section = tree.css_first('span.keyword')
             if keywords_section:
-                keywords = self.clean_text(keywords_section.get_text())
+                keywords = self.clean_text(keywords_section.text())
+            
+            if abstract and self.cache:
+                self.cache.set(url, abstract, keywords, response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'))
             
             return abstract, keywords
             
@@ -93,29 +391,95 @@ class PaperExtractor:
             logging.error(f"Error extracting from Scopus URL {url}: {str(e)}")
             return None, None
     
-    def extract_from_doi(self, doi: str) -> Tuple[Optional[str], Optional[str]]:
+    def clean_jats(self, abstract: str) -> str:
+        """Clean a CrossRef abstract, which arrives as JATS markup; the parser strips the tags"""
+        return self.clean_text(LexborHTMLParser(abstract).text())
+    
+    async def extract_from_doi(self, doi: str) -> Tuple[Optional[str], Optional[str]]:
         """Fallback: Extract using DOI via CrossRef API"""
+        api_url = f"{CROSSREF_WORKS_URL}/{doi}"
+        conditional = {}
+        if self.cache:
+            cached = self.cache.get(api_url)
+            if cached:
+                return cached
+            conditional = self.cache.validators(api_url)
+        
         try:
-            api_url = f"https://api.crossref.org/works/{doi}"
-            response = self.session.get(api_url, timeout=10)
-            response.raise_for_status()
+            query = f"?{urlencode({'mailto': self.mailto})}" if self.mailto else ''
+            response, body = await self.fetch(api_url + query, timeout=10, headers=conditional)
+            if response.status_code == 304:
+                return self.cache.revalidate(api_url)
             
-            data = response.json()
+            data = json.loads(body)
             abstract = data.get('message', {}).get('abstract', '')
             
             if abstract:
-                return self.clean_text(abstract), None
+                abstract = self.clean_jats(abstract)
+                if abstract and self.cache:
+                    self.cache.set(api_url, abstract, None, response.headers.get('ETag'),
+                                   response.headers.get('Last-Modified'))
+                return abstract, None
             
         except Exception as e:
             logging.debug(f"CrossRef API failed for DOI {doi}: {str(e)}")
         
         return None, None
     
-    def process_paper(self, row: pd.Series) -> Dict[str, str]:
-        """Process a single paper and extract abstract"""
-        scopus_url = row.get('Link', '')
-        doi = row.get('DOI', '')
+    async def extract_from_dois(self, dois: list) -> Dict[str, str]:
+        """Fallback for many papers: look up to CROSSREF_BATCH_SIZE DOIs with one CrossRef request.
         
+        Returns the cleaned abstract for each DOI that has one. If the batch request fails,
+        each DOI is retried on its own with extract_from_doi.
+        """
+        found = {}
+        batch = []
+        for doi in dois:
+            cached = self.cache.get(f"{CROSSREF_WORKS_URL}/{doi}") if self.cache else None
+            if cached:
+                found[doi] = cached[0]
+            elif ',' not in doi:  # commas separate filter values
+                batch.append(doi)
+        retry = [doi for doi in dois if doi not in found and doi not in batch]
+        
+        if batch:
+            params = {
+                'filter': ','.join(f'doi:{doi}' for doi in batch),
+                'rows': len(batch),
+                'select': 'DOI,abstract'
+            }
+            if self.mailto:
+                params['mailto'] = self.mailto
+            try:
+                _, body = await self.fetch(f"{CROSSREF_WORKS_URL}?{urlencode(params)}", timeout=30)
+                items = json.loads(body).get('message', {}).get('items', [])
+                
+                # CrossRef may change the DOI's case, so match case-insensitively
+                abstracts = {item.get('DOI', '').lower(): item.get('abstract') for item in items}
+                for doi in batch:
+                    abstract = abstracts.get(doi.lower())
+                    if abstract:
+                        abstract = self.clean_jats(abstract)
+                    if abstract:
+                        found[doi] = abstract
+                        if self.cache:
+                            self.cache.set(f"{CROSSREF_WORKS_URL}/{doi}", abstract, None)
+            except Exception as e:
+                logging.debug(f"CrossRef batch lookup failed, retrying {len(batch)} DOIs one by one: {str(e)}")
+                retry.extend(batch)
+        
+        results = await asyncio.gather(*(self.extract_from_doi(doi) for doi in retry))
+        for doi, (abstract, _) in zip(retry, results):
+            if abstract:
+                found[doi] = abstract
+        
+        return found
+    
+    async def process_paper(self, scopus_url: str, doi: str, fallback_to_doi: bool = True) -> Dict[str, str]:
+        """Process a single paper from its Scopus URL and DOI and extract abstract.
+        
+        With fallback_to_doi=False only Scopus is tried, leaving the DOI for a batched CrossRef lookup.
+        """
         result = {
             'Abstract': '',
             'Keywords': '',
@@ -123,8 +487,8 @@ class PaperExtractor:
         }
         
         # Try Scopus URL first
-        if scopus_url:
-            abstract, keywords = self.extract_from_scopus(scopus_url)
+        if scopus_url and _is_http_url(scopus_url):
+            abstract, keywords = await self.extract_from_scopus(scopus_url)
             if abstract:
                 result['Abstract'] = abstract
                 result['Keywords'] = keywords or ''
@@ -132,8 +496,8 @@ class PaperExtractor:
                 return result
         
         # Fallback to DOI
-        if doi:
-            abstract, keywords = self.extract_from_doi(doi)
+        if doi and fallback_to_doi and _is_doi(doi):
+            abstract, keywords = await self.extract_from_doi(doi)
             if abstract:
                 result['Abstract'] = abstract
                 result['Keywords'] = keywords or ''
@@ -142,15 +506,188 @@ class PaperExtractor:
         
         return result
 
+async def process_paper_async(extractor: PaperExtractor, i: int, links: list, dois: list,
+                              abstracts: list, keywords: list, statuses: list, results: asyncio.Queue,
+                              pbar: tqdm) -> None:
+    """Extract one paper, store the result in the result lists and queue it for the checkpoint writer"""
+    try:
+        # CrossRef is queried afterwards in batches, see process_doi_batch
+        result = await extractor.process_paper(links[i], dois[i], fallback_to_doi=False)
+        
+        abstracts[i] = result['Abstract']
+        keywords[i] = result['Keywords']
+        statuses[i] = result['Status']
+        
+        # Log progress
+        if result['Status'].startswith('Success'):
+            logging.info(f"Paper {i+1}/{len(links)}: {result['Status']}")
+        elif not _is_doi(dois[i]):
+            logging.warning(f"Paper {i+1}/{len(links)}: Failed")
+        
+        await results.put({'Link': links[i], 'Abstract': abstracts[i], 'Keywords': keywords[i], 'Status': statuses[i]})
+        
+    except Exception as e:
+        logging.error(f"Error processing paper {i+1}: {str(e)}")
+    
+    pbar.update(1)
+
+async def process_doi_batch(extractor: PaperExtractor, batch: list, links: list, dois: list,
+                            abstracts: list, statuses: list, results: asyncio.Queue, pbar: tqdm) -> None:
+    """Look up the DOIs of a batch of rows Scopus failed on and queue the results for the checkpoint writer"""
+    try:
+        found = await extractor.extract_from_dois([dois[i] for i in batch])
+        
+        for i in batch:
+            abstracts[i] = found.get(dois[i], '')
+            statuses[i] = 'Success - DOI' if abstracts[i] else 'Failed'
+            
+            # Log progress
+            if abstracts[i]:
+                logging.info(f"Paper {i+1}/{len(links)}: {statuses[i]}")
+                await results.put({'Link': links[i], 'Abstract': abstracts[i], 'Keywords': '', 'Status': statuses[i]})
+            else:
+                logging.warning(f"Paper {i+1}/{len(links)}: Failed")
+        
+    except Exception as e:
+        logging.error(f"Error processing DOI batch starting at paper {batch[0]+1}: {str(e)}")
+    
+    pbar.update(len(batch))
+
+async def checkpoint_writer(results: asyncio.Queue, checkpoint_file: str, batch_size: int) -> None:
+    """Append each finished paper to the JSONL checkpoint, syncing to disk every batch_size papers.
+    
+    This is the only coroutine touching the file, so lines are never interleaved. A None item stops it.
+    """
+    written = 0
+    with open(checkpoint_file, 'a', buffering=1 << 16) as ckpt_f:
+        while True:
+            record = await results.get()
+            if record is None:
+                break
+            ckpt_f.write(json.dumps(record) + '\n')
+            written += 1
+            
+            if written % batch_size == 0:
+                ckpt_f.flush()
+                os.fsync(ckpt_f.fileno())
+                logging.info(f"Checkpoint saved at {written} papers")
+
+async def paper_worker(extractor: PaperExtractor, jobs: Iterator[int], links: list, dois: list,
+                       abstracts: list, keywords: list, statuses: list, results: asyncio.Queue, pbar: tqdm) -> None:
+    """Take row indices from the shared jobs iterator until it is exhausted"""
+    for i in jobs:
+        await process_paper_async(extractor, i, links, dois, abstracts, keywords, statuses, results, pbar)
+
+async def extract_all(links: list, dois: list, abstracts: list, keywords: list, statuses: list, pending: list,
+                      checkpoint_file: str, cache_file: str, batch_size: int, mailto: str,
+                      per_host_limit: int, max_retries: int) -> None:
+    """Run the extraction for all pending rows, filling abstracts, keywords and statuses in place.
+    
+    Rows are sharded by the host of their link, and each host gets its own pool of
+    host_limit(host) workers, so a busy host never holds up the others. Papers Scopus failed
+    on then fall back to CrossRef in batches of CROSSREF_BATCH_SIZE DOIs.
+    """
+    results = asyncio.Queue()
+    writer = asyncio.create_task(checkpoint_writer(results, checkpoint_file, batch_size))
+    with AbstractCache(cache_file) as cache:
+        async with PaperExtractor(per_host_limit=per_host_limit, max_retries=max_retries, cache=cache,
+                                  mailto=mailto) as extractor:
+            with tqdm(total=len(pending), desc="Extracting abstracts") as pbar:
+                buckets = defaultdict(list)
+                for i in pending:
+                    buckets[urlparse(links[i]).netloc].append(i)
+                
+                workers = []
+                for host, rows in buckets.items():
+                    jobs = iter(rows)
+                    workers.extend(
+                        paper_worker(extractor, jobs, links, dois, abstracts, keywords, statuses, results, pbar)
+                        for _ in range(min(extractor.host_limit(host), len(rows)))
+                    )
+                await asyncio.gather(*workers)
+            
+            fallback = [i for i in pending if not abstracts[i] and _is_doi(dois[i])]
+            with tqdm(total=len(fallback), desc="CrossRef fallback") as pbar:
+                batches = [
+                    fallback[start:start + CROSSREF_BATCH_SIZE]
+                    for start in range(0, len(fallback), CROSSREF_BATCH_SIZE)
+                ]
+                await asyncio.gather(*(
+                    process_doi_batch(extractor, batch, links, dois, abstracts, statuses, results, pbar)
+                    for batch in batches
+                ))
+    await results.put(None)
+    await writer
+
+def load_checkpoint(checkpoint_file: str) -> pd.DataFrame:
+    """Read the JSONL checkpoint, dropping a last line torn by a crash mid-write.
+    
+    The file is also cut back to its last complete line, so records appended by this run
+    start on a fresh line instead of being glued to the torn one.
+    """
+    with open(checkpoint_file, 'rb+') as ckpt_f:
+        data = ckpt_f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            logging.warning(f"Dropping incomplete last checkpoint line ({len(data) - end} bytes)")
+            ckpt_f.truncate(end)
+    
+    records = []
+    for line in data[:end].splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            logging.warning("Skipping unreadable checkpoint line")
+    return pd.DataFrame(records, columns=['Link', 'Abstract', 'Keywords', 'Status'])
+
+def write_parquet(df: pd.DataFrame, path: str) -> None:
+    """Write a DataFrame as zstd-compressed Parquet.
+    
+    Hand-edited sheets often mix numbers and text in one column, which Arrow cannot store,
+    so such columns are written as strings (missing values stay missing).
+    """
+    df = df.copy()
+    for col in df.select_dtypes(include='object'):
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+
+def load_input(input_file: str, sheet_name: str, cache_file: str) -> pd.DataFrame:
+    """Load the input sheet, reusing a Parquet copy unless the workbook changed since it was written.
+    
+    The copy stores the sheet's values unchanged. Sheets Arrow cannot store as they are (e.g. a
+    column mixing numbers and text) are not cached and are read from Excel on every run.
+    """
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(input_file):
+        return pd.read_parquet(cache_file)
+    
+    df = pd.read_excel(input_file, sheet_name=sheet_name)
+    try:
+        df.to_parquet(cache_file, engine='pyarrow', compression='zstd', index=False)
+    except (TypeError, ValueError) as e:
+        # pyarrow's ArrowTypeError / ArrowInvalid
+        logging.warning(f"Not caching input sheet as Parquet: {str(e)}")
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+    return df
+
 def main():
     """Main execution function"""
     
     # Configuration
     INPUT_FILE = 'REVA_Lit_Open and Subscription Based_Edited Data.xlsx'
     SHEET_NAME = 'REVA_Scopus_Subscription Based'
-    OUTPUT_FILE = 'REVA_Papers_With_Abstracts.xlsx'
-    CHECKPOINT_FILE = 'progress_checkpoint.csv'
+    INPUT_CACHE_FILE = f'{INPUT_FILE}.{SHEET_NAME}.parquet'  # parsed sheet, reused across runs
+    OUTPUT_FILE = 'REVA_Papers_With_Abstracts.parquet'
+    EXCEL_OUTPUT_FILE = 'REVA_Papers_With_Abstracts.xlsx'  # set to None to skip the slow Excel export
+    CHECKPOINT_FILE = 'progress_checkpoint.jsonl'
+    CACHE_FILE = 'abstract_cache.sqlite3'
     BATCH_SIZE = 50
+    PER_HOST_LIMIT = 8  # concurrent requests to hosts not listed in HOST_CONCURRENCY
+    MAX_RETRIES = 5  # attempts per request on 429/5xx or connection errors
+    CROSSREF_MAILTO = os.environ.get('CROSSREF_MAILTO', '')  # joins CrossRef's faster polite pool
+    
+    start_log_listener()
     
     print("="*60)
     print("REVA Paper Abstract Extraction Pipeline")
@@ -158,57 +695,50 @@ def main():
     
     # Load data
     print(f"\nLoading data from {INPUT_FILE}...")
-    df = pd.read_excel(INPUT_FILE, sheet_name=SHEET_NAME)
+    df = load_input(INPUT_FILE, SHEET_NAME, INPUT_CACHE_FILE)
     print(f"Loaded {len(df)} papers")
     
+    # Pull the input columns out once; per-row pandas indexing is slow
+    links = df['Link'].fillna('').astype(str).str.strip().tolist()
+    dois = df['DOI'].fillna('').astype(str).str.strip().tolist()
+    
     # Check if checkpoint exists
-    start_index = 0
-    if os.path.exists(CHECKPOINT_FILE):
-        checkpoint_df = pd.read_csv(CHECKPOINT_FILE)
-        df_merged = df.merge(checkpoint_df, on='Link', how='left')
-        df['Abstract'] = df_merged['Abstract']
-        df['Keywords'] = df_merged['Keywords']
-        start_index = df['Abstract'].notna().sum()
-        print(f"\nResuming from checkpoint: {start_index} papers already processed")
+    if os.path.exists(CHECKPOINT_FILE) and os.path.getsize(CHECKPOINT_FILE) > 0:
+        # A paper retried after failing appears more than once; its latest line wins.
+        # Rows without a link cannot be told apart, so those are simply processed again
+        checkpoint_df = load_checkpoint(CHECKPOINT_FILE)
+        checkpoint_df = checkpoint_df[checkpoint_df['Link'] != '']
+        checkpoint_df = checkpoint_df.drop_duplicates(subset='Link', keep='last')
+        df_merged = pd.DataFrame({'Link': links}).merge(checkpoint_df, on='Link', how='left')
+        abstracts = df_merged['Abstract'].fillna('').astype(str).tolist()
+        keywords = df_merged['Keywords'].fillna('').astype(str).tolist()
+        statuses = df_merged['Status'].fillna('').astype(str).tolist()
+        print(f"\nResuming from checkpoint: {sum(map(bool, abstracts))} papers already processed")
     else:
-        df['Abstract'] = ''
-        df['Keywords'] = ''
+        abstracts = [''] * len(df)
+        keywords = [''] * len(df)
+        statuses = [''] * len(df)
     
-    # Initialize extractor
-    extractor = PaperExtractor(rate_limit=2)
+    # Papers complete out of order, so resume every row still missing an abstract
+    pending = [i for i, abstract in enumerate(abstracts) if not abstract]
     
     # Process papers
-    print(f"\nProcessing papers {start_index} to {len(df)}...")
+    print(f"\nProcessing {len(pending)} of {len(df)} papers...")
+    asyncio.run(extract_all(links, dois, abstracts, keywords, statuses, pending, CHECKPOINT_FILE, CACHE_FILE,
+                            BATCH_SIZE, CROSSREF_MAILTO, PER_HOST_LIMIT, MAX_RETRIES))
     
-    for i in tqdm(range(start_index, len(df)), desc="Extracting abstracts"):
-        try:
-            result = extractor.process_paper(df.iloc[i])
-            
-            df.at[i, 'Abstract'] = result['Abstract']
-            df.at[i, 'Keywords'] = result['Keywords']
-            
-            # Log progress
-            if result['Status'].startswith('Success'):
-                logging.info(f"Paper {i+1}/{len(df)}: {result['Status']}")
-            else:
-                logging.warning(f"Paper {i+1}/{len(df)}: Failed")
-            
-            # Save checkpoint every BATCH_SIZE papers
-            if (i + 1) % BATCH_SIZE == 0:
-                checkpoint_cols = ['Link', 'Abstract', 'Keywords']
-                df[checkpoint_cols].to_csv(CHECKPOINT_FILE, index=False)
-                logging.info(f"Checkpoint saved at {i+1} papers")
-            
-            # Rate limiting
-            time.sleep(extractor.rate_limit)
-            
-        except Exception as e:
-            logging.error(f"Error processing paper {i+1}: {str(e)}")
-            continue
+    # Assign each result column once instead of writing cells row by row; replacing the
+    # whole column also replaces an empty (float64) Abstract/Keywords column from the sheet
+    df['Abstract'] = abstracts
+    df['Keywords'] = keywords
+    df['Status'] = statuses
     
     # Save final output
     print(f"\nSaving results to {OUTPUT_FILE}...")
-    df.to_excel(OUTPUT_FILE, index=False)
+    write_parquet(df, OUTPUT_FILE)
+    if EXCEL_OUTPUT_FILE:
+        print(f"Saving results to {EXCEL_OUTPUT_FILE}...")
+        df.to_excel(EXCEL_OUTPUT_FILE, index=False)
     
     # Statistics
     success_count = df['Abstract'].astype(bool).sum()
@@ -221,6 +751,8 @@ def main():
     print(f"Successfully extracted: {success_count}")
     print(f"Success rate: {success_rate:.2f}%")
     print(f"Output saved to: {OUTPUT_FILE}")
+    if EXCEL_OUTPUT_FILE:
+        print(f"Excel copy saved to: {EXCEL_OUTPUT_FILE}")
     print("="*60)
     
     # Cleanup checkpoint